@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Shared configuration, read from the environment and an optional .env file.
+"""
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# KEY=value, ignoring comment lines
+ENV_LINE_RE = re.compile(r'^\s*([^#=]+)=(.*)$')
+
+@lru_cache(maxsize=None)
+def load_dotenv(path=".env"):
+    """
+    Loads KEY=value pairs from a .env file into os.environ. Each path is only parsed once.
+    """
+    env_file = Path(path)
+    if not env_file.exists():
+        return
+    for line in env_file.read_text().splitlines():
+        match = ENV_LINE_RE.match(line)
+        if match:
+            key, value = match.groups()
+            os.environ[key.strip()] = value.strip().strip('"').strip("'")
+
+load_dotenv()
+
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+JENKINS_USER = os.environ.get("JENKINS_USER")
+JENKINS_API_TOKEN = os.environ.get("JENKINS_API_TOKEN")
+
+def parse_repo(repo_path):
+    """
+    Splits "owner/repo" into (owner, name). Returns None if the format is invalid.
+    """
+    owner, sep, name = repo_path.partition("/")
+    if not sep or not owner or not name or "/" in name:
+        return None
+    return owner, name
+
+def iter_repos(file_path):
+    """
+    Yields repository paths from a text file, skipping empty lines and comments.
+    """
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+def load_repos(file_path):
+    """
+    Loads repository paths from a text file, dropping duplicates while keeping file order.
+    """
+    if not os.path.exists(file_path):
+        print(f"⚠️ Warning: File {file_path} not found.")
+        return []
+    return list(dict.fromkeys(iter_repos(file_path)))
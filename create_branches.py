@@ -1,54 +1,52 @@
 #!/usr/bin/env python3
-import requests
 import json
 import sys
 import os
-
-# Load environment variables (simple .env loader)
-def load_dotenv(path=".env"):
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            for line in f:
-                if "=" in line and not line.strip().startswith("#"):
-                    parts = line.strip().split("=", 1)
-                    if len(parts) == 2:
-                        key, value = parts
-                        os.environ[key] = value.strip('"').strip("'")
+import asyncio
+import argparse
+from config import GITHUB_TOKEN, load_repos, parse_repo
+from github_client import cached_get, create_client, github_request, save_etag_cache
 
 # Load configuration
-load_dotenv()
-GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 REPO_FILE = "repos-full.txt"
 SOURCE_BRANCH = "develop"
+# Number of repositories processed concurrently (override with JOBS=<n>)
+MAX_CONCURRENCY = int(os.environ.get("JOBS", 32))
 
-def create_branch_via_api(repo_owner, repo_name, new_branch, source_branch, token):
+async def create_branch_via_api(client, repo_owner, repo_name, new_branch, source_branch, check_exists=True):
     """
     Creates a new branch from a source branch using the GitHub REST API.
+    The given httpx.AsyncClient is shared by all repositories so requests are multiplexed.
+    With check_exists=False the existing-branch lookup is skipped and a 422 from the create call reports it instead.
     """
-    # 1. Get the SHA of the source branch
+    # The singular git/ref endpoint only matches the exact ref, unlike git/refs which also lists prefixes
+    new_ref_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/ref/heads/{new_branch}"
     ref_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/refs/heads/{source_branch}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
 
     try:
-        response = requests.get(ref_url, headers=headers)
-        if response.status_code != 200:
+        # 1. Skip repos where the branch already exists (a 304 on repeated runs)
+        if check_exists:
+            _, existing_ref = await cached_get(client, new_ref_url)
+            if existing_ref is not None:
+                print(f"ℹ️ Branch '{new_branch}' already exists in {repo_owner}/{repo_name}")
+                return True
+
+        # 2. Get the SHA of the source branch
+        response, ref_data = await cached_get(client, ref_url)
+        if ref_data is None:
             print(f"❌ Error fetching '{source_branch}' for {repo_owner}/{repo_name}: {response.status_code} {response.text}")
             return False
         
-        source_sha = response.json()["object"]["sha"]
+        source_sha = ref_data["object"]["sha"]
         
-        # 2. Create the new reference
+        # 3. Create the new reference
         create_ref_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/refs"
         payload = {
             "ref": f"refs/heads/{new_branch}",
             "sha": source_sha
         }
         
-        create_res = requests.post(create_ref_url, headers=headers, json=payload)
+        create_res = await github_request(client, "POST", create_ref_url, json=payload)
         if create_res.status_code == 201:
             print(f"✅ Created branch '{new_branch}' in {repo_owner}/{repo_name}")
             return True
@@ -63,28 +61,38 @@ def create_branch_via_api(repo_owner, repo_name, new_branch, source_branch, toke
         print(f"❌ Exception occurred for {repo_owner}/{repo_name}: {str(e)}")
         return False
 
-def load_repos(file_path):
+async def create_branches(repos, new_branch, check_exists):
     """
-    Loads repository paths from a text file, skipping empty lines and comments.
+    Creates the branch in all repositories concurrently over one client.
+    Returns the number of repositories where the branch was created or already existed.
     """
-    repos = []
-    if not os.path.exists(file_path):
-        print(f"⚠️ Warning: File {file_path} not found.")
-        return repos
-        
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                repos.append(line)
-    return repos
+    semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENCY))
+
+    async def create_one(owner, name):
+        async with semaphore:
+            return await create_branch_via_api(client, owner, name, new_branch, SOURCE_BRANCH, check_exists)
+
+    async with create_client(GITHUB_TOKEN) as client:
+        tasks = []
+        for repo_path in repos:
+            parsed = parse_repo(repo_path)
+            if not parsed:
+                print(f"❌ Invalid repo format in {REPO_FILE}: {repo_path} (Expected: owner/repo)")
+                continue
+            owner, name = parsed
+            tasks.append(create_one(owner, name))
+        results = await asyncio.gather(*tasks)
+
+    return sum(1 for created in results if created)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 create_branches.py <new_branch_name>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description=f"Create a branch from '{SOURCE_BRANCH}' in every repository listed in {REPO_FILE}")
+    parser.add_argument("new_branch", help="Name of the branch to create")
+    parser.add_argument("--assume-new", action="store_true",
+                        help="Skip checking whether the branch already exists (saves a request per repo on first runs)")
+    args = parser.parse_args()
         
-    new_branch = sys.argv[1]
+    new_branch = args.new_branch
     
     if not GITHUB_TOKEN:
         print("❌ Error: GITHUB_TOKEN not found in environment or .env file.")
@@ -98,14 +106,8 @@ def main():
         
     print(f"� Creating branch '{new_branch}' from '{SOURCE_BRANCH}' for {len(repos)} repositories via API...\n")
     
-    success_count = 0
-    for repo_path in repos:
-        try:
-            owner, name = repo_path.split("/")
-            if create_branch_via_api(owner, name, new_branch, SOURCE_BRANCH, GITHUB_TOKEN):
-                success_count += 1
-        except ValueError:
-            print(f"❌ Invalid repo format in {REPO_FILE}: {repo_path} (Expected: owner/repo)")
+    success_count = asyncio.run(create_branches(repos, new_branch, not args.assume_new))
+    save_etag_cache()
 
     print(f"\n📊 Processed {len(repos)} repositories. {success_count} success/exists.")
 
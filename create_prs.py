@@ -1,40 +1,26 @@
 #!/usr/bin/env python3
-import os
 import sys
 import json
+import time
+import asyncio
+import argparse
 import webbrowser
-import requests
-
-# Load environment variables (simple .env loader)
-def load_dotenv(path=".env"):
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            for line in f:
-                if "=" in line and not line.strip().startswith("#"):
-                    parts = line.strip().split("=", 1)
-                    if len(parts) == 2:
-                        key, value = parts
-                        os.environ[key] = value.strip('"').strip("'")
+from config import GITHUB_TOKEN, load_repos, parse_repo
+from github_client import cached_get, create_client, github_request, save_etag_cache
 
 # Load configuration
-load_dotenv()
-GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 REPO_FILE = "repos-full.txt"
 DEFAULT_BASE_BRANCH = "master"
+MAX_CONCURRENCY = 32
+BROWSER_OPEN_DELAY = 0.1
 
-def create_pull_request(repo_owner, repo_name, head_branch, base_branch, token):
+async def create_pull_request(client, semaphore, repo_owner, repo_name, head_branch, base_branch):
     """
     Creates a GitHub pull request using the REST API.
     Returns the PR URL if successful or already exists, else None.
     """
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls"
     
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    
     # Determine the PR title
     if head_branch.startswith("release-"):
         # Format: release-3.17.0-20260130 -> Release 3.17.0-20260130
@@ -49,58 +35,99 @@ def create_pull_request(repo_owner, repo_name, head_branch, base_branch, token):
         "body": f"Automated pull request to merge changes from {head_branch} into {base_branch}."
     }
     
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        
-        if response.status_code == 201:
-            pr_data = response.json()
-            print(f"✅ Created PR for {repo_owner}/{repo_name}")
-            return pr_data['html_url']
-        elif response.status_code == 422:
-            # Often means PR already exists, try to find the existing one
-            error_data = response.json()
-            message = error_data.get("errors", [{}])[0].get("message", "Validation failed")
-            if "A pull request already exists" in message:
-                print(f"ℹ️ PR already exists for {repo_owner}/{repo_name}")
-                # Fetch existing PR to get URL
-                prs_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls"
-                params = {"head": f"{repo_owner}:{head_branch}", "base": base_branch, "state": "open"}
-                pr_res = requests.get(prs_url, headers=headers, params=params)
-                if pr_res.status_code == 200 and pr_res.json():
-                    return pr_res.json()[0]['html_url']
-            else:
-                print(f"❌ Failed to create PR for {repo_owner}/{repo_name}: {message}")
-        else:
-            print(f"❌ Error {response.status_code} for {repo_owner}/{repo_name}: {response.text}")
+    async with semaphore:
+        try:
+            response = await github_request(client, "POST", url, json=payload)
             
-    except Exception as e:
-        print(f"❌ Exception occurred for {repo_owner}/{repo_name}: {str(e)}")
+            if response.status_code == 201:
+                pr_data = response.json()
+                print(f"✅ Created PR for {repo_owner}/{repo_name}")
+                return pr_data['html_url']
+            elif response.status_code == 422:
+                # Often means PR already exists, try to find the existing one
+                error_data = response.json()
+                message = error_data.get("errors", [{}])[0].get("message", "Validation failed")
+                if "A pull request already exists" in message:
+                    print(f"ℹ️ PR already exists for {repo_owner}/{repo_name}")
+                    # Fetch existing PR to get URL
+                    prs_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls"
+                    params = {"head": f"{repo_owner}:{head_branch}", "base": base_branch, "state": "open"}
+                    _, existing_prs = await cached_get(client, prs_url, params=params)
+                    if existing_prs:
+                        return existing_prs[0]['html_url']
+                else:
+                    print(f"❌ Failed to create PR for {repo_owner}/{repo_name}: {message}")
+            else:
+                print(f"❌ Error {response.status_code} for {repo_owner}/{repo_name}: {response.text}")
+                
+        except Exception as e:
+            print(f"❌ Exception occurred for {repo_owner}/{repo_name}: {str(e)}")
     
     return None
 
-def load_repos(file_path):
+async def create_pull_requests(repos, head_branch, base_branch, token):
+    """
+    Creates pull requests for all repositories concurrently.
+    Returns the PR URLs in the same order as the repository list.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with create_client(token) as client:
+        tasks = []
+        for repo_path in repos:
+            parsed = parse_repo(repo_path)
+            if not parsed:
+                print(f"❌ Invalid repo format in {REPO_FILE}: {repo_path} (Expected: owner/repo)")
+                continue
+            owner, name = parsed
+            tasks.append(asyncio.create_task(
+                create_pull_request(client, semaphore, owner, name, head_branch, base_branch)
+            ))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [url for url in results if isinstance(url, str)]
+
+def open_all(pr_urls):
+    """
+    Opens every PR's changes view in a new browser tab without prompting.
+    """
+    for url in pr_urls:
+        webbrowser.open_new_tab(f"{url}/changes")
+        # Brief pause so the browser doesn't drop tabs opened in a burst
+        time.sleep(BROWSER_OPEN_DELAY)
+    print(f"\n✅ Opened {len(pr_urls)} pull requests in your browser.")
+
+def review_interactive(pr_urls):
     """
-    Loads repository paths from a text file, skipping empty lines and comments.
+    Opens the PRs one at a time, waiting for Enter between each.
     """
-    repos = []
-    if not os.path.exists(file_path):
-        print(f"⚠️ Warning: File {file_path} not found.")
-        return repos
+    for i, url in enumerate(pr_urls):
+        full_url = f"{url}/changes"
+        print(f"\n[{i+1}/{len(pr_urls)}] Opening: {full_url}")
+        webbrowser.open(full_url)
         
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                repos.append(line)
-    return repos
+        if i < len(pr_urls) - 1:
+            print("👉 Press Enter to open the next PR (or 'q' to quit): ", end="", flush=True)
+            choice = sys.stdin.readline().strip().lower()
+            if choice == 'q':
+                break
+    print("\n✅ Review session complete.")
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 create_prs.py <head-branch-name> [base-branch-name]")
-        sys.exit(1)
-        
-    head_branch = sys.argv[1]
-    base_branch = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_BASE_BRANCH
+    parser = argparse.ArgumentParser(description=f"Create pull requests for repositories listed in {REPO_FILE}")
+    parser.add_argument("head_branch", help="Branch to merge from")
+    parser.add_argument("base_branch", nargs="?", default=DEFAULT_BASE_BRANCH,
+                        help=f"Branch to merge into (default: {DEFAULT_BASE_BRANCH})")
+    review = parser.add_mutually_exclusive_group()
+    review.add_argument("--open-all", action="store_true",
+                        help="Open every PR in the browser without prompting")
+    review.add_argument("--no-open", action="store_true",
+                        help="Only print the PR URLs")
+    review.add_argument("--review-interactive", action="store_true",
+                        help="Open PRs one at a time, pressing Enter between each")
+    args = parser.parse_args()
+    
+    head_branch = args.head_branch
+    base_branch = args.base_branch
     
     if not GITHUB_TOKEN:
         print("❌ Error: GITHUB_TOKEN not found in environment or .env file.")
@@ -114,35 +141,24 @@ def main():
         
     print(f"🚀 Creating PRs from '{head_branch}' to '{base_branch}' for {len(repos)} repositories...\n")
     
-    pr_urls = []
-    for repo_path in repos:
-        try:
-            owner, name = repo_path.split("/")
-            url = create_pull_request(owner, name, head_branch, base_branch, GITHUB_TOKEN)
-            if url:
-                pr_urls.append(url)
-        except ValueError:
-            print(f"❌ Invalid repo format in {REPO_FILE}: {repo_path} (Expected: owner/repo)")
+    pr_urls = asyncio.run(create_pull_requests(repos, head_branch, base_branch, GITHUB_TOKEN))
+    save_etag_cache()
 
     if pr_urls:
         print("\n🔗 Created/Existing Pull Requests (Changes View):")
         for url in pr_urls:
             print(f"{url}/changes")
         
-        print("\n👀 Would you like to review them in your browser now? (Y/n): ", end="", flush=True)
-        review_all = sys.stdin.readline().strip().lower()
-        if review_all != 'n':
-            for i, url in enumerate(pr_urls):
-                full_url = f"{url}/changes"
-                print(f"\n[{i+1}/{len(pr_urls)}] Opening: {full_url}")
-                webbrowser.open(full_url)
-                
-                if i < len(pr_urls) - 1:
-                    print("👉 Press Enter to open the next PR (or 'q' to quit): ", end="", flush=True)
-                    choice = sys.stdin.readline().strip().lower()
-                    if choice == 'q':
-                        break
-            print("\n✅ Review session complete.")
+        if args.no_open:
+            return
+        if args.review_interactive:
+            review_interactive(pr_urls)
+        elif args.open_all:
+            open_all(pr_urls)
+        else:
+            print("\n👀 Would you like to open them all in your browser now? (Y/n): ", end="", flush=True)
+            if sys.stdin.readline().strip().lower() != 'n':
+                open_all(pr_urls)
     else:
         print("\n⚠️ No pull requests were created or found.")
 
@@ -1,49 +1,86 @@
-import os
 import sys
 import json
+import asyncio
 import argparse
-import requests
+from config import GITHUB_TOKEN, load_repos, parse_repo
+from github_client import create_client, github_request
 
-# Load environment variables (simple .env loader)
-def load_dotenv(path=".env"):
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            for line in f:
-                if "=" in line and not line.strip().startswith("#"):
-                    key, value = line.strip().split("=", 1)
-                    os.environ[key] = value.strip('"').strip("'")
-
-load_dotenv()
-
-# Provide your GitHub personal access token via environment variable or .env
-github_token = os.getenv("GITHUB_TOKEN")
 repofile = "repos-release.txt"
 
 # Replace this with your desired target branch
 target_branch = "master"
 
-def create_github_release(repo_owner, repo_name, tag_name, target_branch, github_token=None):
+GRAPHQL_URL = "https://api.github.com/graphql"
+MAX_CONCURRENCY = 32
+
+def build_target_branch_query(repos, target_branch):
+    """
+    Builds a single GraphQL query that resolves the target branch of every repository.
+
+    :param repos: List of (repo_owner, repo_name) tuples.
+    :param target_branch: The branch the releases are created from.
+    :return: GraphQL query string; repository i is aliased as "r{i}".
+    """
+    fields = []
+    for i, (repo_owner, repo_name) in enumerate(repos):
+        fields.append(
+            f"r{i}: repository(owner: {json.dumps(repo_owner)}, name: {json.dumps(repo_name)}) "
+            f"{{ ref(qualifiedName: {json.dumps('refs/heads/' + target_branch)}) {{ target {{ oid }} }} }}"
+        )
+    return "query { " + " ".join(fields) + " }"
+
+async def verify_target_branches(client, repos, target_branch):
+    """
+    Checks in one GraphQL request that the target branch exists in every repository.
+
+    :param repos: List of (repo_owner, repo_name) tuples.
+    :return: Tuple (shas, errors). shas maps (repo_owner, repo_name) to the branch head SHA, or None
+             if the repository exists but the branch does not. errors maps repositories GitHub could not
+             resolve (e.g. NOT_FOUND, FORBIDDEN) to the error message. Repositories in neither could not
+             be checked. Returns None if the check itself failed.
+    """
+    query = build_target_branch_query(repos, target_branch)
+    response = await github_request(client, "POST", GRAPHQL_URL, json={"query": query})
+    if response.status_code != 200:
+        print(f"Failed to verify target branches: {response.status_code} {response.text}")
+        return None
+
+    body = response.json()
+    data = body.get("data")
+    if not data:
+        # Rate limiting, query and auth errors come back as HTTP 200 with "data": null
+        print(f"Failed to verify target branches: {body.get('errors')}")
+        return None
+
+    aliases = {f"r{i}": repo for i, repo in enumerate(repos)}
+    errors = {}
+    for error in body.get("errors") or []:
+        path = error.get("path") or []
+        if path and path[0] in aliases:
+            errors[aliases[path[0]]] = f"{error.get('type', 'ERROR')}: {error.get('message', '')}"
+
+    shas = {}
+    for alias, repo in aliases.items():
+        repository = data.get(alias)
+        if repository is not None and repo not in errors:
+            ref = repository.get("ref")
+            shas[repo] = ref["target"]["oid"] if ref else None
+    return shas, errors
+
+async def create_github_release(client, repo_owner, repo_name, tag_name, target_branch):
     """
     Creates a GitHub release with the specified parameters using GitHub's "Generate release notes" feature.
 
+    :param client: Shared httpx.AsyncClient carrying the GitHub auth headers.
     :param repo_owner: Owner of the repository (e.g., "octocat").
     :param repo_name: Name of the repository (e.g., "Hello-World").
     :param tag_name: The tag name for the release.
     :param target_branch: The branch the release is created from.
-    :param github_token: GitHub personal access token.
     :return: Response JSON from GitHub API.
     """
 
-    if not github_token:
-        raise ValueError("GitHub token is required to authenticate the request.")
-
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases"
 
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json"
-    }
-
     payload = {
         "tag_name": tag_name,
         "target_commitish": target_branch,
@@ -51,7 +88,7 @@ def create_github_release(repo_owner, repo_name, tag_name, target_branch, github
         "generate_release_notes": True
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
+    response = await github_request(client, "POST", url, json=payload)
 
     if response.status_code == 201:
         print(f"Release created successfully for {repo_name} with tag {tag_name}!")
@@ -60,17 +97,45 @@ def create_github_release(repo_owner, repo_name, tag_name, target_branch, github
 
     return response.json()
 
-# Function to load repositories from file, skipping comments and empty lines
-def load_repos(file_path):
-    repos = []
-    if not os.path.exists(file_path):
-        return repos
-    with open(file_path, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                repos.append(line)
-    return repos
+async def create_releases(repos, tag_name, target_branch, github_token):
+    """
+    Verifies the target branch of all repositories in one GraphQL request,
+    then creates the releases concurrently.
+
+    :param repos: List of (repo_owner, repo_name) tuples.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def create_one(repo_owner, repo_name):
+        async with semaphore:
+            try:
+                return await create_github_release(
+                    client,
+                    repo_owner,
+                    repo_name,
+                    tag_name,
+                    target_branch
+                )
+            except Exception as e:
+                print(f"Failed to create release for {repo_name}: {e}")
+
+    async with create_client(github_token) as client:
+        verified = await verify_target_branches(client, repos, target_branch)
+        if verified is None:
+            # Preflight failed; attempt every repository as before
+            ready = list(repos)
+        else:
+            shas, errors = verified
+            ready = []
+            for repo in repos:
+                if repo in errors:
+                    print(f"Skipping {repo[1]}: {errors[repo]}")
+                elif repo in shas and shas[repo] is None:
+                    print(f"Skipping {repo[1]}: branch '{target_branch}' not found in {repo[0]}/{repo[1]}")
+                else:
+                    ready.append(repo)
+
+        await asyncio.gather(*(create_one(repo_owner, repo_name) for repo_owner, repo_name in ready))
 
 if __name__ == "__main__":
 
@@ -86,15 +151,17 @@ if __name__ == "__main__":
         print(f"⚠️ No repositories found in {repofile}")
         sys.exit(0)
 
+    if not GITHUB_TOKEN:
+        print("❌ Error: GITHUB_TOKEN not found in environment or .env file.")
+        sys.exit(1)
+
+    parsed_repos = []
     for repo in repos:
-        try:
-            repo_owner, repo_name = repo.split("/")
-            create_github_release(
-                repo_owner,
-                repo_name,
-                args.tag_name,
-                target_branch,
-                github_token
-            )
-        except ValueError:
+        parsed = parse_repo(repo)
+        if parsed:
+            parsed_repos.append(parsed)
+        else:
             print(f"Invalid repo format: {repo}. Expected format is 'owner/repository'.")
+
+    if parsed_repos:
+        asyncio.run(create_releases(parsed_repos, args.tag_name, target_branch, GITHUB_TOKEN))
@@ -3,212 +3,187 @@
 Script to fetch Jenkins version information for repositories listed in repos-release.txt.
 
 Usage:
-    python get_jenkins_versions.py          # Fetch versions (you must be logged in already)
-    python get_jenkins_versions.py --login  # Open browser to log in to Jenkins first
+    python get_jenkins_versions.py
 
 Prerequisites:
-    pip install selenium
+    pip install requests
+    JENKINS_USER and JENKINS_API_TOKEN set in the environment or .env
+    (create an API token under your Jenkins user -> Configure -> API Token)
 """
 
 import os
 import sys
 import re
-import time
 import argparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from config import JENKINS_USER, JENKINS_API_TOKEN, load_repos
 
 # Configuration
 JENKINS_BASE_URL = "https://jenkins.dev.hk.privemanagers.com"
 JENKINS_VIEW_PATH = "/view/Prive%20Micro/job"
 REPO_FILE = "repos-release.txt"
-PROFILE_DIR = os.path.expanduser("~/.config/jenkins-chrome-profile")
+REQUEST_TIMEOUT = 30
+MAX_WORKERS = 16
 
+# Release version patterns, e.g. "Version 2026-02-06.master-15"
+VERSION_RE = re.compile(r'Version\s+(\d{4}-\d{2}-\d{2}\.[a-zA-Z0-9_-]+)')
+ALT_VERSION_RE = re.compile(r'(\d{4}-\d{2}-\d{2}\.master-\d+)')
 
-def load_repos(file_path):
-    """Load repositories from file, skipping comments and empty lines."""
-    repos = []
-    if not os.path.exists(file_path):
-        return repos
-    with open(file_path, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                repos.append(line)
-    return repos
+# Serializes output from worker threads so lines don't interleave
+print_lock = threading.Lock()
 
 
-def create_chrome_driver():
-    """Create a Chrome driver instance with a dedicated persistent profile."""
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    # Use a dedicated persistent profile for this script
-    chrome_options.add_argument(f"--user-data-dir={PROFILE_DIR}")
-    
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-        print(f"✅ Launched Chrome browser")
-        print(f"   Profile: {PROFILE_DIR}")
-        return driver
-    except Exception as e:
-        print(f"❌ Failed to launch Chrome: {e}")
-        sys.exit(1)
+def log(message):
+    with print_lock:
+        print(message)
 
 
-def login_mode(driver):
-    """Open Jenkins for the user to log in manually."""
-    print("\n🔐 LOGIN MODE")
-    print("=" * 60)
-    print(f"Opening Jenkins at: {JENKINS_BASE_URL}")
-    print("Please log in manually, then press Enter when done...")
-    print("=" * 60)
+def create_jenkins_session():
+    """Create a requests session authenticated with the Jenkins API token."""
+    if not JENKINS_USER or not JENKINS_API_TOKEN:
+        print("❌ Error: JENKINS_USER and JENKINS_API_TOKEN must be set in environment or .env file.")
+        sys.exit(1)
     
-    driver.get(JENKINS_BASE_URL)
-    input("\n>>> Press Enter after you have logged in... ")
-    print("✅ Login complete! Your session is now saved.")
-    print("   Next time, run without --login to fetch versions.")
+    session = requests.Session()
+    session.auth = HTTPBasicAuth(JENKINS_USER, JENKINS_API_TOKEN)
+    # One pooled connection per worker thread
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_job_url(repo_name):
+    """Return the URL of the master branch job for a repository."""
+    return f"{JENKINS_BASE_URL}{JENKINS_VIEW_PATH}/{repo_name}/job/master/"
 
 
-def get_latest_build_info(driver, repo_name):
+def get_json(session, url, params=None):
+    """GET a Jenkins JSON endpoint. Returns the decoded body or None on error."""
+    response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    if response.status_code in (401, 403):
+        log(f"⚠️ Jenkins rejected the credentials ({response.status_code}). Check JENKINS_USER / JENKINS_API_TOKEN")
+        return None
+    if response.status_code != 200:
+        log(f"⚠️ Jenkins returned {response.status_code} for {url}")
+        return None
+    return response.json()
+
+
+def get_latest_build_info(session, repo_name):
     """
-    Navigate to Jenkins job page, find the latest build number and check Push Docker status.
+    Query the Jenkins job API for the latest build number and check Push Docker status.
     Returns (build_number, docker_success_bool) or (None, False).
     """
-    url = f"{JENKINS_BASE_URL}{JENKINS_VIEW_PATH}/{repo_name}/job/master/"
+    job_url = get_job_url(repo_name)
     
     try:
-        driver.get(url)
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(5)  # Wait for Stage View to load
-        
-        page_source = driver.page_source
-        
-        # Check if we're on a login page
-        if "login" in page_source.lower() and "password" in page_source.lower():
-            print(f"  ⚠️ Jenkins requires login! Run with --login first")
+        # 1. Find the latest build number
+        job = get_json(session, f"{job_url}api/json", params={"tree": "lastBuild[number]"})
+        if not job or not job.get("lastBuild"):
             return None, False
         
-        # 1. Find the latest build number from the page
-        # Look for build links in Jenkins format
-        build_link_pattern = rf'/job/{repo_name}/job/master/(\d+)/'
-        build_numbers = re.findall(build_link_pattern, page_source)
-        
-        if not build_numbers:
-            build_numbers = re.findall(r'href=["\'](\d+)/["\']', page_source)
-        
-        if not build_numbers:
-            return None, False
-            
-        latest_build = max(int(num) for num in build_numbers)
-        build_str = str(latest_build)
+        build_str = str(job["lastBuild"]["number"])
         
-        # 2. Check Push Docker status
+        # 2. Check Push Docker status from the pipeline stage results
         docker_success = True # Default to true if we can't find the info
-        headers = driver.find_elements(By.CSS_SELECTOR, "th.stage-header-name-")
-        if not headers:
-            headers = driver.find_elements(By.TAG_NAME, "th")
-            
-        push_docker_idx = -1
-        for i, h in enumerate(headers):
-            if "Push Docker" in h.text:
-                push_docker_idx = i
-                break
-        
-        if push_docker_idx != -1:
-            rows = driver.find_elements(By.CSS_SELECTOR, "tr.job-row")
-            if not rows:
-                rows = driver.find_elements(By.TAG_NAME, "tr")
-            
-            target_row = None
-            for row in rows:
-                if f"#{build_str}" in row.text:
-                    target_row = row
-                    break
-            
-            if target_row:
-                cells = target_row.find_elements(By.TAG_NAME, "td")
-                if len(cells) > push_docker_idx:
-                    cell = cells[push_docker_idx]
-                    classes = cell.get_attribute('class') or ""
-                    
-                    # Log the status found
-                    if "SUCCESS" in classes:
-                        print(f"  🐳 Push Docker: SUCCESS")
-                        docker_success = True
-                    else:
-                        docker_success = False
-                        # Try to extract a clean status name if possible (e.g., 'FAILED', 'IN_PROGRESS')
-                        status = "NOT SUCCESSFUL"
-                        for s in ["FAILED", "IN_PROGRESS", "ABORTED", "UNSTABLE"]:
-                            if s in classes:
-                                status = s
-                                break
-                        print(f"  🐳 Push Docker: {status} (Class: {classes})")
-                else:
-                    print(f"  ⚠️ Could not find stage cell for Push Docker")
+        describe = get_json(session, f"{job_url}{build_str}/wfapi/describe")
+        stages = describe.get("stages", []) if describe else []
+        
+        push_docker = next((stage for stage in stages if "Push Docker" in stage.get("name", "")), None)
+        if push_docker:
+            status = push_docker.get("status", "UNKNOWN")
+            if status == "SUCCESS":
+                log(f"[{repo_name}] 🐳 Push Docker: SUCCESS")
+            else:
+                docker_success = False
+                log(f"[{repo_name}] 🐳 Push Docker: {status}")
+        elif describe:
+            log(f"[{repo_name}] ⚠️ Could not find stage result for Push Docker")
         
         return build_str, docker_success
 
     except Exception as e:
-        print(f"  ⚠️ Error getting build info for {repo_name}: {e}")
+        log(f"[{repo_name}] ⚠️ Error getting build info: {e}")
         return None, False
 
 
-def get_release_version(driver, repo_name, build_number):
+def get_release_version(session, repo_name, build_number):
     """
-    Navigate to the specific build page and extract the release version.
+    Query the build API and extract the release version.
     Looks for text like "Version 2026-02-06.master-15" and extracts "2026-02-06.master-15".
     """
-    url = f"{JENKINS_BASE_URL}{JENKINS_VIEW_PATH}/{repo_name}/job/master/{build_number}/"
+    url = f"{get_job_url(repo_name)}{build_number}/api/json"
+    params = {"tree": "displayName,description,actions[parameters[name,value]]"}
     
     try:
-        driver.get(url)
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(3)  # Wait for dynamic content
+        build = get_json(session, url, params=params)
+        if not build:
+            return None
         
-        page_source = driver.page_source
+        # Collect every text field the version may appear in
+        texts = [build.get("displayName") or "", build.get("description") or ""]
+        for action in build.get("actions", []):
+            for parameter in (action or {}).get("parameters", []):
+                texts.append(str(parameter.get("value", "")))
+        build_text = "\n".join(texts)
         
         # Look for "Version X.X.X" pattern
-        version_match = re.search(r'Version\s+(\d{4}-\d{2}-\d{2}\.[a-zA-Z0-9_-]+)', page_source)
+        version_match = VERSION_RE.search(build_text)
         
         if version_match:
             return version_match.group(1)
         
         # Alternative pattern
-        alt_match = re.search(r'(\d{4}-\d{2}-\d{2}\.master-\d+)', page_source)
+        alt_match = ALT_VERSION_RE.search(build_text)
         if alt_match:
             return alt_match.group(1)
         
         return None
-    except TimeoutException:
-        print(f"  ⚠️ Timeout loading build page for {repo_name} #{build_number}")
-        return None
-    except WebDriverException as e:
-        print(f"  ⚠️ Browser error: {str(e)[:100]}")
+    except requests.Timeout:
+        log(f"[{repo_name}] ⚠️ Timeout loading build info for #{build_number}")
         return None
     except Exception as e:
-        print(f"  ⚠️ Error getting release version for {repo_name}: {e}")
+        log(f"[{repo_name}] ⚠️ Error getting release version: {e}")
         return None
 
 
+def process_repo(session, full_repo):
+    """
+    Fetch the latest build version and Push Docker status for one repository.
+    Returns (repo_name, version, docker_ok).
+    """
+    # Extract repo name (part after the slash)
+    repo_name = full_repo.rpartition('/')[2]
+    
+    # Get latest build number and Docker status
+    build_number, docker_success = get_latest_build_info(session, repo_name)
+    
+    if not build_number:
+        log(f"[{repo_name}] ⚠️ Could not find latest build number")
+        return repo_name, "N/A", True
+    
+    log(f"[{repo_name}] 📦 Latest build: #{build_number}")
+    
+    # Get release version
+    release_version = get_release_version(session, repo_name, build_number)
+    
+    if release_version:
+        log(f"[{repo_name}] ✅ Release version: {release_version}")
+        return repo_name, release_version, docker_success
+    
+    log(f"[{repo_name}] ⚠️ Could not extract release version")
+    return repo_name, "N/A", docker_success
+
+
 def main():
     """Main function to fetch Jenkins versions for all repositories."""
     parser = argparse.ArgumentParser(description="Fetch Jenkins version information")
-    parser.add_argument("--login", action="store_true", 
-                        help="Open browser to log in to Jenkins first")
-    args = parser.parse_args()
+    parser.parse_args()
     
     # Get the script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -217,52 +192,23 @@ def main():
     # Load repositories
     repos = load_repos(repo_file_path)
     
-    if not repos and not args.login:
+    if not repos:
         print(f"⚠️ No repositories found in {REPO_FILE}")
         sys.exit(0)
     
-    if not args.login:
-        print(f"📋 Found {len(repos)} repositories to process\n")
+    print(f"📋 Found {len(repos)} repositories to process\n")
     
-    # Launch Chrome
-    driver = create_chrome_driver()
+    session = create_jenkins_session()
     
     try:
-        if args.login:
-            login_mode(driver)
-            return
+        results = [None] * len(repos)
         
-        results = []
-        
-        for full_repo in repos:
-            # Extract repo name (part after the slash)
-            repo_name = full_repo.split('/')[-1] if '/' in full_repo else full_repo
-            
-            print(f"🔍 Processing: {repo_name}")
-            
-            # Get latest build number and Docker status
-            build_number, docker_success = get_latest_build_info(driver, repo_name)
-            
-            if not build_number:
-                print(f"  ⚠️ Could not find latest build number")
-                results.append((repo_name, "N/A", True))
-                continue
-            
-            print(f"  📦 Latest build: #{build_number}")
-            
-            # Get release version
-            release_version = get_release_version(driver, repo_name, build_number)
-            
-            if release_version:
-                print(f"  ✅ Release version: {release_version}")
-                results.append((repo_name, release_version, docker_success))
-            else:
-                print(f"  ⚠️ Could not extract release version")
-                results.append((repo_name, "N/A", docker_success))
-            
-            time.sleep(1)  # Small delay between requests
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(repos))) as executor:
+            futures = {executor.submit(process_repo, session, full_repo): i for i, full_repo in enumerate(repos)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         
-        # Print summary
+        # Print summary in repository file order
         print("\n" + "=" * 60)
         print("📊 SUMMARY: Repository -> Release Version")
         print("=" * 60)
@@ -274,8 +220,7 @@ def main():
         return results
     
     finally:
-        driver.quit()
-        print("\n📑 Closed Chrome browser")
+        session.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for talking to the GitHub REST API.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+from urllib.parse import urlencode
+import httpx
+
+# Persisted ETags so repeated runs can use conditional requests.
+# A 304 Not Modified carries no body and does not count against the rate limit.
+ETAG_CACHE_FILE = "etag_cache.json"
+
+_etag_cache = None
+
+# Pause once fewer than this many primary rate-limit requests remain
+RATE_LIMIT_THRESHOLD = 50
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+
+# Seconds before a request is abandoned, so a stalled connection can't block a task forever
+REQUEST_TIMEOUT = 30
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+# Transient gateway errors; only retried for GET since a repeated POST could act twice
+TRANSIENT_STATUSES = (502, 503, 504)
+API_VERSION = "2022-11-28"
+
+def github_headers(token):
+    """
+    Returns the default headers for authenticated GitHub REST API requests.
+    """
+    return {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": API_VERSION
+    }
+
+class RateLimiter:
+    """
+    Tracks GitHub's X-RateLimit-* response headers and decides how long to wait.
+    """
+    def __init__(self, threshold=RATE_LIMIT_THRESHOLD):
+        self.threshold = threshold
+        self.remaining = None
+        self.reset = None
+
+    def update(self, headers):
+        if "X-RateLimit-Remaining" in headers:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset" in headers:
+            self.reset = int(headers["X-RateLimit-Reset"])
+
+    def pause_seconds(self):
+        """
+        Seconds to wait before the next request so the primary rate limit is not exhausted.
+        """
+        if self.remaining is None or self.reset is None or self.remaining >= self.threshold:
+            return 0
+        return max(0, self.reset - time.time())
+
+    def retry_delay(self, status, headers, attempt):
+        """
+        Seconds to wait before retrying a rate-limited response, or None if it should not be retried.
+        A 403 is only retried when GitHub marks it as rate limiting; other 403s are permission errors.
+        """
+        if status not in (403, 429):
+            return None
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            delay = int(retry_after)
+        elif status == 403 and headers.get("X-RateLimit-Remaining") == "0" and self.reset:
+            delay = self.reset - time.time()
+        elif status == 429:
+            delay = 0
+        else:
+            return None
+        return max(delay, BACKOFF_BASE * 2 ** attempt + random.uniform(0, 1))
+
+# Shared by every client in the process; GitHub limits per token, not per connection
+rate_limiter = RateLimiter()
+
+def create_client(token):
+    """
+    Returns an httpx.AsyncClient for the GitHub API with auth headers and a timeout set.
+    HTTP/2 multiplexes concurrent requests over one TCP+TLS connection to api.github.com.
+    """
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+    # retries= re-attempts failed connection setup; HTTP error statuses are handled in github_request
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=3)
+    return httpx.AsyncClient(transport=transport, headers=github_headers(token), timeout=REQUEST_TIMEOUT)
+
+async def github_request(client, method, url, limiter=None, **kwargs):
+    """
+    Sends a request, waiting out GitHub rate limits and retrying rate-limited (403/429)
+    responses with exponential backoff. GETs are also retried on 502/503/504.
+    """
+    limiter = limiter or rate_limiter
+    for attempt in range(MAX_ATTEMPTS):
+        pause = limiter.pause_seconds()
+        if pause:
+            print(f"⏳ Rate limit nearly exhausted, waiting {pause:.0f}s for reset...")
+            await asyncio.sleep(pause)
+
+        response = await client.request(method, url, **kwargs)
+        limiter.update(response.headers)
+
+        delay = limiter.retry_delay(response.status_code, response.headers, attempt)
+        if delay is None and method == "GET" and response.status_code in TRANSIENT_STATUSES:
+            delay = BACKOFF_BASE * 2 ** attempt
+        if delay is None or attempt == MAX_ATTEMPTS - 1:
+            return response
+        print(f"⏳ Got {response.status_code} from {url}, retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+
+def _get_etag_cache():
+    global _etag_cache
+    if _etag_cache is None:
+        _etag_cache = {}
+        if os.path.exists(ETAG_CACHE_FILE):
+            try:
+                with open(ETAG_CACHE_FILE, "r") as f:
+                    _etag_cache = json.load(f)
+            except (OSError, ValueError):
+                print(f"⚠️ Warning: Ignoring unreadable {ETAG_CACHE_FILE}")
+    return _etag_cache
+
+def save_etag_cache():
+    """
+    Writes the ETag cache back to disk. Call once at the end of a run.
+    """
+    if _etag_cache is None:
+        return
+    with open(ETAG_CACHE_FILE, "w") as f:
+        json.dump(_etag_cache, f)
+
+async def cached_get(client, url, headers=None, params=None):
+    """
+    Performs a conditional GET using a previously stored ETag.
+    Returns (response, data): on 304 Not Modified, data is the cached JSON body;
+    on 200 it is the fresh body (and the cache is updated); otherwise None.
+    """
+    key = f"{url}?{urlencode(params)}" if params else url
+    entry = _get_etag_cache().get(key)
+    headers = dict(headers or {})
+    if entry:
+        headers["If-None-Match"] = entry["etag"]
+
+    response = await github_request(client, "GET", url, headers=headers, params=params)
+
+    if response.status_code == 304 and entry:
+        return response, entry["body"]
+    if response.status_code == 200:
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            _get_etag_cache()[key] = {"etag": etag, "body": data}
+        return response, data
+    return response, None